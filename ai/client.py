@@ -1,27 +1,73 @@
 import os
-import requests
+import asyncio
+import functools
+import hashlib
+import importlib.util
+import httpx
 import logging
-from typing import Dict, Optional, Any
-from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
-from accelerate import Accelerator
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Any
+from utils.disk_cache import open_disk_cache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Default server URL
 DEFAULT_SERVER_URL = "http://127.0.0.1:8000"
+# Seconds before a cached health check result is re-probed
+HEALTH_CHECK_TTL = 30
 
-# Initialize accelerator
-accelerator = Accelerator()
-DEVICE = accelerator.device
-
-# Model state (for direct generation)
+# Model state (for direct generation). torch/transformers/accelerate are imported lazily
+# in prepare_model so CLI commands that never generate don't pay for them.
+DEVICE = None
 MODEL_LOADED = False
+MODEL_WARMED = False
 MODEL = None
 TOKENIZER = None
-GENERATOR = None
+
+# Optional TensorRT-LLM engine (built with scripts/build_trt.py) used instead of the HF model
+USE_TRT = os.getenv("USE_TRT") == "1"
+TRT_ENGINE_DIR = os.getenv("TRT_ENGINE_DIR", "./trt_engine")
+
+# Pre-allocated KV cache, reused across generate() calls instead of reallocating per call
+MAX_CACHE_LEN = int(os.getenv("MODEL_MAX_CACHE_LEN", "4096"))
+KV_CACHE = None
+# With MODEL_COMPILE=1, MODEL.forward is swapped between these two: the compiled one is
+# only valid for the fixed shapes of the static cache
+_EAGER_FORWARD = None
+_COMPILED_FORWARD = None
+# The static cache is shared state, so generations run one at a time
+_GENERATION_LOCK = threading.Lock()
+
+# Static prompt prefixes; keeping them first lets vLLM's prefix cache share their KV blocks
+_COMMIT_PROMPT_PREFIX = "Generate a clear and concise commit message for the following code changes:\n\n"
+_PR_PROMPT_PREFIX = "Summarize the changes for ticket"
+
+# Diff budget in prompt tokens; the character cap is only used when no tokenizer is loaded
+_MAX_DIFF_TOKENS = 3500
+_MAX_DIFF_CHARS = 5000
+
+# Commit message cache: in-process LRU plus an on-disk tier when diskcache is installed.
+# Set AIBITJIRA_NO_CACHE=1 to always regenerate.
+_COMMIT_CACHE_SIZE = 512
+# Seconds a commit message stays in the disk tier
+_COMMIT_CACHE_TTL = 24 * 60 * 60
+_COMMIT_MAX_NEW_TOKENS = 150
+# Placeholder/error texts returned by the generators; these must never be cached
+_GENERATION_FAILURES = ("[AI generation unavailable", "[Error during generation")
+
+def _commit_cache_key(diff: str, ticket: Optional[str], server_url: str) -> str:
+    """
+    Cache key for a commit message: diff digest, ticket, generation length and the model
+    that would produce it, so switching models or servers doesn't serve stale messages.
+    """
+    digest = hashlib.blake2b(diff.encode("utf-8"), digest_size=16).hexdigest()
+    model = "|".join((os.getenv("MODEL_ID", ""), os.getenv("MODEL_BACKEND", "transformers"),
+                      str(USE_TRT), server_url))
+    model_digest = hashlib.blake2b(model.encode("utf-8"), digest_size=8).hexdigest()
+    return f"commit:{digest}:{ticket or ''}:{_COMMIT_MAX_NEW_TOKENS}:{model_digest}"
 
 # Create singleton client
 _client = None
@@ -40,25 +86,59 @@ class ModelClient:
     def __init__(self, server_url: str = None):
         """Initialize client with server URL"""
         self.server_url = server_url or os.getenv("MODEL_SERVER_URL", DEFAULT_SERVER_URL)
-        self.session = requests.Session()
-        self._server_available = None  # Cache for server availability status
+        # Pooled keep-alive connections. uvicorn only speaks HTTP/1.1, so HTTP/2 is only
+        # negotiated for an https server URL (e.g. behind a TLS proxy) when h2 is installed
+        self._http2 = (self.server_url.startswith("https://")
+                       and importlib.util.find_spec("h2") is not None)
+        self._limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        self.session = httpx.Client(http2=self._http2, limits=self._limits, timeout=30.0)
+        self._async_session = None
+        self._async_loop = None
+        self._server_available = None  # Cached (available, checked_at) server status
+        self._health_probe: Optional[threading.Thread] = None
+        self._commit_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._disk_cache = None if os.getenv("AIBITJIRA_NO_CACHE") == "1" else open_disk_cache("ai")
+
+    @property
+    def async_session(self) -> httpx.AsyncClient:
+        """Async HTTP client bound to the running event loop (pooled connections can't cross loops)"""
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_loop is not loop:
+            self._async_session = httpx.AsyncClient(http2=self._http2, limits=self._limits, timeout=30.0)
+            self._async_loop = loop
+        return self._async_session
         
     def check_health(self) -> bool:
         """Check if the model server is running"""
         try:
             response = self.session.get(f"{self.server_url}/health", timeout=2)
-            self._server_available = response.status_code == 200
-            return self._server_available
-        except requests.RequestException as e:
+            available = response.status_code == 200
+        except httpx.HTTPError as e:
             logger.warning(f"Model server health check failed: {e}")
-            self._server_available = False
-            return False
+            available = False
+        self._server_available = (available, time.monotonic())
+        return available
     
     def is_server_available(self) -> bool:
         """Check if server is available (using cached value if possible)"""
         if self._server_available is None:
             return self.check_health()
-        return self._server_available
+        available, checked_at = self._server_available
+        if time.monotonic() - checked_at > HEALTH_CHECK_TTL:
+            # Re-probe in the background so the caller doesn't wait on the health check timeout
+            self._reprobe_health()
+        return available
+
+    def _reprobe_health(self):
+        """Start a background health check unless one is already running"""
+        if self._health_probe is not None and self._health_probe.is_alive():
+            return
+        self._health_probe = threading.Thread(target=self.check_health, daemon=True)
+        self._health_probe.start()
+
+    def _mark_server_unavailable(self):
+        """Record a failed request so the next calls go straight to direct generation"""
+        self._server_available = (False, time.monotonic())
     
     def generate(self, prompt: str, max_new_tokens: int = 1000, 
                  do_sample: bool = True, top_p: float = 0.95, 
@@ -69,26 +149,75 @@ class ModelClient:
             return _generate_with_model(prompt, max_new_tokens, do_sample, top_p, temperature)
             
         try:
-            response = self.session.post(
+            # Stream tokens over SSE so long generations aren't bound by a single read timeout
+            chunks = []
+            with self.session.stream(
+                "POST",
                 f"{self.server_url}/generate",
                 json={
                     "prompt": prompt,
                     "max_new_tokens": max_new_tokens,
                     "do_sample": do_sample,
                     "top_p": top_p,
-                    "temperature": temperature
+                    "temperature": temperature,
+                    "stream": True
                 },
-                timeout=30  # Longer timeout for generation
-            )
-            response.raise_for_status()
-            result = response.json()
-            return result.get("text", "")
-        except requests.RequestException as e:
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if line.startswith("data: "):
+                        chunks.append(json.loads(line[len("data: "):]).get("t", ""))
+            return "".join(chunks).strip()
+        except httpx.HTTPError as e:
             logger.warning(f"Model server request failed, falling back to direct generation: {e}")
-            self._server_available = False  # Mark server as unavailable
+            self._mark_server_unavailable()
             return _generate_with_model(prompt, max_new_tokens, do_sample, top_p, temperature)
     
+    def _get_cached_commit_message(self, key: str) -> Optional[str]:
+        """Look up a commit message in the memory tier, then the disk tier"""
+        if key in self._commit_cache:
+            self._commit_cache.move_to_end(key)
+            return self._commit_cache[key]
+        if self._disk_cache is not None:
+            message = self._disk_cache.get(key)
+            if message:
+                self._remember_commit_message(key, message, persist=False)
+                return message
+        return None
+
+    def _remember_commit_message(self, key: str, message: str, persist: bool = True):
+        """Store a generated commit message unless it is a placeholder or error"""
+        if not message or message.startswith(_GENERATION_FAILURES):
+            return
+        self._commit_cache[key] = message
+        self._commit_cache.move_to_end(key)
+        if len(self._commit_cache) > _COMMIT_CACHE_SIZE:
+            self._commit_cache.popitem(last=False)
+        if persist and self._disk_cache is not None:
+            self._disk_cache.set(key, message, expire=_COMMIT_CACHE_TTL)
+
+    def forget_commit_message(self, diff: str, ticket: Optional[str] = None):
+        """Drop a cached commit message, e.g. one the user rejected, so the next call regenerates"""
+        key = _commit_cache_key(diff, ticket, self.server_url)
+        self._commit_cache.pop(key, None)
+        if self._disk_cache is not None:
+            self._disk_cache.delete(key)
+
     def generate_commit_message(self, diff: str, ticket: Optional[str] = None) -> str:
+        """Generate commit message from diff and optional ticket, reusing cached results"""
+        if os.getenv("AIBITJIRA_NO_CACHE") == "1":
+            return self._generate_commit_message_uncached(diff, ticket)
+
+        key = _commit_cache_key(diff, ticket, self.server_url)
+        cached = self._get_cached_commit_message(key)
+        if cached:
+            logger.info("Using cached commit message")
+            return cached
+        message = self._generate_commit_message_uncached(diff, ticket)
+        self._remember_commit_message(key, message)
+        return message
+
+    def _generate_commit_message_uncached(self, diff: str, ticket: Optional[str] = None) -> str:
         """Generate commit message from diff and optional ticket"""
         if not self.is_server_available():
             logger.info("Server unavailable, using direct model generation for commit message")
@@ -98,14 +227,13 @@ class ModelClient:
             response = self.session.post(
                 f"{self.server_url}/commit",
                 json={"diff": diff, "ticket": ticket},
-                timeout=30
             )
             response.raise_for_status()
             result = response.json()
             return result.get("message", "")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.warning(f"Model server request failed, falling back to direct generation: {e}")
-            self._server_available = False
+            self._mark_server_unavailable()
             return _generate_commit_message_with_model(diff, ticket)
     
     def generate_pr_description(self, ticket: str, diff: str, 
@@ -119,22 +247,165 @@ class ModelClient:
             response = self.session.post(
                 f"{self.server_url}/pr",
                 json={"ticket": ticket, "diff": diff, "template": template},
-                timeout=30
             )
             response.raise_for_status()
             result = response.json()
             return result.get("description", "")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             logger.warning(f"Model server request failed, falling back to direct generation: {e}")
-            self._server_available = False
+            self._mark_server_unavailable()
             return _generate_pr_description_with_model(ticket, diff, template)
 
+    async def agenerate(self, prompt: str, max_new_tokens: int = 1000,
+                        do_sample: bool = True, top_p: float = 0.95,
+                        temperature: float = 0.7) -> str:
+        """Async variant of generate, so several prompts can be in flight at once"""
+        if not self.is_server_available():
+            logger.info("Server unavailable, using direct model generation")
+            return await asyncio.to_thread(_generate_with_model, prompt, max_new_tokens,
+                                           do_sample, top_p, temperature)
+
+        try:
+            response = await self.async_session.post(
+                f"{self.server_url}/generate",
+                json={
+                    "prompt": prompt,
+                    "max_new_tokens": max_new_tokens,
+                    "do_sample": do_sample,
+                    "top_p": top_p,
+                    "temperature": temperature
+                },
+            )
+            response.raise_for_status()
+            return response.json().get("text", "")
+        except httpx.HTTPError as e:
+            logger.warning(f"Model server request failed, falling back to direct generation: {e}")
+            self._mark_server_unavailable()
+            return await asyncio.to_thread(_generate_with_model, prompt, max_new_tokens,
+                                           do_sample, top_p, temperature)
+
+    async def agenerate_commit_message(self, diff: str, ticket: Optional[str] = None) -> str:
+        """Async variant of generate_commit_message"""
+        if os.getenv("AIBITJIRA_NO_CACHE") == "1":
+            return await self._agenerate_commit_message_uncached(diff, ticket)
+
+        key = _commit_cache_key(diff, ticket, self.server_url)
+        cached = self._get_cached_commit_message(key)
+        if cached:
+            logger.info("Using cached commit message")
+            return cached
+        message = await self._agenerate_commit_message_uncached(diff, ticket)
+        self._remember_commit_message(key, message)
+        return message
+
+    async def _agenerate_commit_message_uncached(self, diff: str, ticket: Optional[str] = None) -> str:
+        """Generate commit message from diff and optional ticket without blocking the event loop"""
+        if not self.is_server_available():
+            logger.info("Server unavailable, using direct model generation for commit message")
+            return await asyncio.to_thread(_generate_commit_message_with_model, diff, ticket)
+
+        try:
+            response = await self.async_session.post(
+                f"{self.server_url}/commit",
+                json={"diff": diff, "ticket": ticket},
+            )
+            response.raise_for_status()
+            return response.json().get("message", "")
+        except httpx.HTTPError as e:
+            logger.warning(f"Model server request failed, falling back to direct generation: {e}")
+            self._mark_server_unavailable()
+            return await asyncio.to_thread(_generate_commit_message_with_model, diff, ticket)
+
+    async def agenerate_pr_description(self, ticket: str, diff: str,
+                                       template: Optional[str] = None) -> str:
+        """Async variant of generate_pr_description"""
+        if not self.is_server_available():
+            logger.info("Server unavailable, using direct model generation for PR description")
+            return await asyncio.to_thread(_generate_pr_description_with_model, ticket, diff, template)
+
+        try:
+            response = await self.async_session.post(
+                f"{self.server_url}/pr",
+                json={"ticket": ticket, "diff": diff, "template": template},
+            )
+            response.raise_for_status()
+            return response.json().get("description", "")
+        except httpx.HTTPError as e:
+            logger.warning(f"Model server request failed, falling back to direct generation: {e}")
+            self._mark_server_unavailable()
+            return await asyncio.to_thread(_generate_pr_description_with_model, ticket, diff, template)
+
 # Internal model functions (private)
+def _select_dtype() -> "torch.dtype":
+    """Pick the weight dtype: bfloat16 on Ampere+, float16 on older GPUs, float32 on CPU"""
+    import torch
+    if not torch.cuda.is_available():
+        return torch.float32
+    if torch.cuda.is_bf16_supported():
+        return torch.bfloat16
+    return torch.float16
+
+def _attn_implementation() -> str:
+    """Use FlashAttention-2 on Ampere+ GPUs when flash-attn is installed, else PyTorch's fused SDPA"""
+    import torch
+    if (torch.cuda.is_available()
+            and torch.cuda.get_device_capability()[0] >= 8
+            and importlib.util.find_spec("flash_attn") is not None):
+        return "flash_attention_2"
+    return "sdpa"
+
+def _quantization_config():
+    """
+    Build a bitsandbytes config from MODEL_QUANTIZATION ("4bit" or "8bit").
+
+    Returns None when quantization is disabled or no CUDA device is available.
+    """
+    mode = os.getenv("MODEL_QUANTIZATION", "").lower()
+    if not mode:
+        return None
+
+    import torch
+    if not torch.cuda.is_available():
+        logger.warning("MODEL_QUANTIZATION requires a CUDA device, loading unquantized weights")
+        return None
+
+    from transformers import BitsAndBytesConfig
+    if mode == "4bit":
+        return BitsAndBytesConfig(
+            load_in_4bit=True,
+            bnb_4bit_compute_dtype=_select_dtype(),
+            bnb_4bit_quant_type="nf4",
+            bnb_4bit_use_double_quant=True,
+        )
+    if mode == "8bit":
+        return BitsAndBytesConfig(load_in_8bit=True)
+    logger.warning(f"Unknown MODEL_QUANTIZATION '{mode}', loading unquantized weights")
+    return None
+
+def prepare_tokenizer(model_id: str = None):
+    """
+    Load only the tokenizer, e.g. for token-based prompt truncation when another backend serves the model.
+    """
+    global TOKENIZER
+    if TOKENIZER is not None:
+        return
+
+    model_id = model_id or os.getenv("MODEL_ID")
+    if not model_id:
+        raise ValueError("MODEL_ID environment variable is not set")
+
+    from transformers import AutoTokenizer
+    TOKENIZER = AutoTokenizer.from_pretrained(model_id)
+    # Batched generation needs a pad token, and decoder-only models must be left-padded
+    if TOKENIZER.pad_token is None:
+        TOKENIZER.pad_token = TOKENIZER.eos_token
+    TOKENIZER.padding_side = "left"
+
 def prepare_model(model_id: str = None):
     """
     Load model from local path or HuggingFace.
     """
-    global MODEL_LOADED, MODEL, TOKENIZER, DEVICE
+    global MODEL_LOADED, MODEL, DEVICE, _EAGER_FORWARD, _COMPILED_FORWARD
     if MODEL_LOADED:
         return
     
@@ -143,62 +414,232 @@ def prepare_model(model_id: str = None):
         raise ValueError("MODEL_ID environment variable is not set")
 
     try:
-        TOKENIZER = AutoTokenizer.from_pretrained(model_id)
-        MODEL = AutoModelForCausalLM.from_pretrained(model_id)
-        MODEL.to(DEVICE)
+        import torch
+        from accelerate import Accelerator
+        from transformers import AutoModelForCausalLM
+
+        DEVICE = Accelerator().device
+        prepare_tokenizer(model_id)
+        if USE_TRT:
+            # The TensorRT engine has its precision and kernels baked in at build time
+            from optimum.nvidia import AutoModelForCausalLM as TRTModelForCausalLM
+            MODEL = TRTModelForCausalLM.from_pretrained(TRT_ENGINE_DIR)
+            logger.info(f"TensorRT engine loaded from {TRT_ENGINE_DIR}")
+        else:
+            # Half-precision weights halve memory traffic on the (bandwidth-bound) decode path;
+            # device_map places the weights, so no explicit MODEL.to(DEVICE) is needed
+            MODEL = AutoModelForCausalLM.from_pretrained(
+                model_id,
+                torch_dtype=_select_dtype(),
+                quantization_config=_quantization_config(),
+                attn_implementation=_attn_implementation(),
+                low_cpu_mem_usage=True,
+                device_map="auto",
+            )
+            if os.getenv("MODEL_COMPILE") == "1" and torch.cuda.is_available():
+                # Capture the decode step into a CUDA graph; relies on the fixed shapes of the StaticCache,
+                # so generations on a dynamic cache keep the eager forward (see _use_forward)
+                _EAGER_FORWARD = MODEL.forward
+                _COMPILED_FORWARD = torch.compile(MODEL.forward, mode="reduce-overhead", fullgraph=True, dynamic=False)
+                logger.info("Model forward compiled with torch.compile")
         logger.info(f"Model loaded from {model_id}")
         MODEL_LOADED = True
     except Exception as e:
         logger.error(f"Error loading model: {e}")
         MODEL_LOADED = False
-
-def _prepare_generator():
-    global GENERATOR
-    if GENERATOR:
         return
-    prepare_model()
-    if not MODEL_LOADED:
+
+    if os.getenv("MODEL_COMPILE") == "1" and not USE_TRT:
+        # Compile now rather than on the first user request
+        warmup_model()
+
+def warmup_model():
+    """
+    Run one short generation so one-time initialization happens off the request path.
+    """
+    global MODEL_WARMED
+    if MODEL_WARMED or not MODEL_LOADED:
         return
-    GENERATOR = pipeline("text-generation", model=MODEL, tokenizer=TOKENIZER, device=DEVICE)
+    import torch
+    _generate_with_model("warmup", max_new_tokens=8, do_sample=False)
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    MODEL_WARMED = True
+    logger.info("Model warmed up")
+
+def _get_kv_cache():
+    """Get or create the static KV cache for the loaded model"""
+    global KV_CACHE
+    if KV_CACHE is None:
+        from transformers import StaticCache
+        KV_CACHE = StaticCache(
+            config=MODEL.config,
+            max_batch_size=1,
+            max_cache_len=MAX_CACHE_LEN,
+            device=DEVICE,
+            dtype=MODEL.dtype,
+        )
+    return KV_CACHE
+
+def _use_forward(static_cache: bool):
+    """Run the compiled forward only on the static cache; dynamic caches would recompile every step"""
+    if _COMPILED_FORWARD is not None:
+        MODEL.forward = _COMPILED_FORWARD if static_cache else _EAGER_FORWARD
+
+def _output_ids(output):
+    """Normalize generate() output to a (batch, seq_len) tensor of token ids"""
+    # optimum-nvidia returns (ids, lengths) with ids shaped (batch, beams, seq_len)
+    if isinstance(output, tuple):
+        output = output[0]
+    if output.dim() == 3:
+        output = output[:, 0]
+    return output
 
 def _generate_with_model(prompt: str, max_new_tokens: int = 1000, 
                          do_sample: bool = True, top_p: float = 0.95, 
-                         temperature: float = 0.7) -> str:
+                         temperature: float = 0.7, streamer: Any = None) -> str:
     """Generate text using the loaded model (internal function)"""
-    _prepare_generator()
+    prepare_model()
     if not MODEL_LOADED:
         return f"[AI generation unavailable - placeholder for: {prompt[:30]}...]"
 
     try:
-        output = GENERATOR(prompt, max_new_tokens=max_new_tokens,
-                           do_sample=do_sample, top_p=top_p, temperature=temperature)
-        return output[0]["generated_text"].replace(prompt, "").strip()
+        inputs = TOKENIZER(prompt, return_tensors="pt").to(DEVICE)
+        generate_kwargs = {
+            "max_new_tokens": max_new_tokens,
+            "do_sample": do_sample,
+            "top_p": top_p,
+            "temperature": temperature,
+            "use_cache": True,
+        }
+        if streamer is not None:
+            generate_kwargs["streamer"] = streamer
+        with _GENERATION_LOCK:
+            # Prompts that would overflow the static cache fall back to a dynamic one;
+            # the TensorRT engine manages its own KV cache
+            static_cache = not USE_TRT and inputs["input_ids"].shape[1] + max_new_tokens <= MAX_CACHE_LEN
+            if static_cache:
+                kv_cache = _get_kv_cache()
+                kv_cache.reset()
+                generate_kwargs["past_key_values"] = kv_cache
+            _use_forward(static_cache)
+            output = _output_ids(MODEL.generate(**inputs, **generate_kwargs))
+        # generate() returns prompt + completion; decode only the new tokens
+        input_len = inputs["input_ids"].shape[1]
+        return TOKENIZER.decode(output[0, input_len:], skip_special_tokens=True).strip()
     except Exception as e:
         logger.error(f"Error during text generation: {e}")
         return f"[Error during generation: {str(e)[:50]}...]"
 
-def _generate_commit_message_with_model(diff: str, ticket: Optional[str] = None) -> str:
-    """Generate commit message directly with model (internal function)"""
-    prompt = f"Generate a clear and concise commit message for the following code changes:\n\n{diff[:5000]}"
+def _stream_with_model(prompt: str, max_new_tokens: int = 1000,
+                       do_sample: bool = True, top_p: float = 0.95,
+                       temperature: float = 0.7) -> Iterator[str]:
+    """Yield generated text chunks as the model produces them (internal function)"""
+    prepare_model()
+    if not MODEL_LOADED:
+        yield f"[AI generation unavailable - placeholder for: {prompt[:30]}...]"
+        return
+
+    from transformers import TextIteratorStreamer
+    streamer = TextIteratorStreamer(TOKENIZER, skip_prompt=True, skip_special_tokens=True)
+
+    def _run():
+        try:
+            result = _generate_with_model(prompt, max_new_tokens, do_sample, top_p, temperature,
+                                          streamer=streamer)
+            # Failures come back as text instead of streamed tokens; pass them on to the client
+            if result.startswith(_GENERATION_FAILURES):
+                streamer.on_finalized_text(result)
+        finally:
+            # Unblock the consumer even if generation failed before finishing the stream
+            streamer.end()
+
+    threading.Thread(target=_run, daemon=True).start()
+    yield from streamer
+
+def _generate_batch_with_model(prompts: List[str], max_new_tokens: int = 1000,
+                               do_sample: bool = True, top_p: float = 0.95,
+                               temperature: float = 0.7) -> List[str]:
+    """Generate text for several prompts in one padded batch (internal function)"""
+    if len(prompts) == 1:
+        return [_generate_with_model(prompts[0], max_new_tokens, do_sample, top_p, temperature)]
+
+    prepare_model()
+    if not MODEL_LOADED:
+        return [f"[AI generation unavailable - placeholder for: {prompt[:30]}...]" for prompt in prompts]
+
+    try:
+        inputs = TOKENIZER(prompts, return_tensors="pt", padding=True).to(DEVICE)
+        with _GENERATION_LOCK:
+            # The static cache is sized for a single sequence, so batches use a dynamic cache
+            _use_forward(static_cache=False)
+            output = _output_ids(MODEL.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                do_sample=do_sample,
+                top_p=top_p,
+                temperature=temperature,
+                pad_token_id=TOKENIZER.pad_token_id,
+                use_cache=True,
+            ))
+        # Left padding aligns every prompt to the same length, so one slice drops them all
+        input_len = inputs["input_ids"].shape[1]
+        texts = TOKENIZER.batch_decode(output[:, input_len:], skip_special_tokens=True)
+        return [text.strip() for text in texts]
+    except Exception as e:
+        logger.error(f"Error during batched text generation: {e}")
+        return [f"[Error during generation: {str(e)[:50]}...]" for _ in prompts]
+
+def _build_commit_prompt(diff: str, ticket: Optional[str] = None) -> str:
+    """Build the commit message prompt for the given diff and optional ticket"""
+    prompt = f"{_COMMIT_PROMPT_PREFIX}{_truncate_diff(diff)}"
     if ticket:
         prompt += f"\n\nInclude the reference to Jira ticket {ticket} in the message."
+    return prompt
+
+def _truncate_diff(diff: str) -> str:
+    """Cut a diff to at most _MAX_DIFF_TOKENS tokens so prefill cost stays bounded"""
+    if TOKENIZER is None:
+        return diff[:_MAX_DIFF_CHARS]
+
+    # A token rarely spans more than 16 characters, so anything past that can't fit anyway
+    head = diff[:_MAX_DIFF_TOKENS * 16]
+    ids = TOKENIZER(head, add_special_tokens=False,
+                    truncation=True, max_length=_MAX_DIFF_TOKENS).input_ids
+    if len(ids) < _MAX_DIFF_TOKENS:
+        return head
+    return TOKENIZER.decode(ids, skip_special_tokens=True)
+
+@functools.lru_cache(maxsize=16)
+def _read_template(path: str, mtime: float) -> str:
+    """Read a template file; mtime is part of the cache key so edits are picked up"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
 
-    message = _generate_with_model(prompt, max_new_tokens=150)
+def _build_pr_prompt(ticket: str, diff: str, template_path: Optional[str] = None) -> str:
+    """Build the PR description prompt, reading the template if one is given"""
+    template = None
+    # Read the template (cached until the file changes)
+    if template_path:
+        template = _read_template(template_path, os.path.getmtime(template_path))
+
+    prompt = f"{_PR_PROMPT_PREFIX} {ticket}:\n\n{_truncate_diff(diff)}"
+    if template:
+        prompt += f"\n\nThe description should be in the format of {template}"
+    return prompt
+
+def _generate_commit_message_with_model(diff: str, ticket: Optional[str] = None) -> str:
+    """Generate commit message directly with model (internal function)"""
+    # Load first so the prompt builder can truncate the diff by tokens
+    prepare_model()
+    message = _generate_with_model(_build_commit_prompt(diff, ticket), max_new_tokens=_COMMIT_MAX_NEW_TOKENS)
     return message
 
 def _generate_pr_description_with_model(ticket: str, diff: str, template_path: Optional[str] = None) -> str:
     """Generate PR description directly with model (internal function)"""
     try:
-        template = None
-        # Read the template
-        if template_path:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                template = f.read()
-
-        # Generate summary
-        description_prompt = f"Summarize the changes for ticket {ticket}:\n\n{diff[:5000]}"
-        if template:
-            description_prompt += f"\n\nThe description should be in the format of {template}"
+        prepare_model()
+        description_prompt = _build_pr_prompt(ticket, diff, template_path)
         description = _generate_with_model(description_prompt, max_new_tokens=150)
         return description
     except Exception as e:
@@ -222,6 +663,19 @@ def generate_commit_message(diff: str, ticket: Optional[str] = None) -> str:
     """Generate commit message using the model server or direct model generation"""
     return get_client().generate_commit_message(diff=diff, ticket=ticket)
 
+def forget_commit_message(diff: str, ticket: Optional[str] = None):
+    """Drop the cached commit message for this diff and ticket"""
+    get_client().forget_commit_message(diff=diff, ticket=ticket)
+
 def generate_pr_description(ticket: str, diff: str, template_path: Optional[str] = None) -> str:
     """Generate PR description using the model server or direct model generation"""
     return get_client().generate_pr_description(ticket=ticket, diff=diff, template=template_path)
+
+def generate_commit_messages(diffs: List[str], ticket: Optional[str] = None) -> List[str]:
+    """Generate commit messages for several diffs concurrently"""
+    async def _gather():
+        client = get_client()
+        return await asyncio.gather(
+            *(client.agenerate_commit_message(diff=diff, ticket=ticket) for diff in diffs)
+        )
+    return list(asyncio.run(_gather()))
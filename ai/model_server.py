@@ -1,29 +1,208 @@
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 import uvicorn
 from pydantic import BaseModel
 from typing import Dict, Optional, Any
+from uuid import uuid4
+import asyncio
+import json
 import logging
 import os
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
-# Import the model functionality
-from ai.client import prepare_model, generate, generate_commit_message, generate_pr_description
+# Import the model functionality. The server always talks to the model directly:
+# going through the public client API would make it call back into itself over HTTP.
+from ai.client import (
+    prepare_model,
+    prepare_tokenizer,
+    _select_dtype,
+    warmup_model,
+    _generate_with_model,
+    _generate_batch_with_model,
+    _stream_with_model,
+    _build_commit_prompt,
+    _build_pr_prompt,
+)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Inference backend: "transformers" (default) or "vllm" for continuous batching
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "transformers").lower()
+
+# Micro-batching settings for the transformers backend
+BATCH_WINDOW_MS = int(os.getenv("MODEL_BATCH_WINDOW_MS", "10"))
+MAX_BATCH_SIZE = int(os.getenv("MODEL_MAX_BATCH_SIZE", "16"))
+
+# vLLM engine (only set when MODEL_BACKEND=vllm)
+ENGINE = None
+# Request batcher (only set for the transformers backend)
+BATCHER = None
+
+class GenerationBatcher:
+    """Collects concurrent generation requests and runs them as padded batches"""
+
+    def __init__(self, max_batch: int = MAX_BATCH_SIZE, window_ms: int = BATCH_WINDOW_MS):
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background worker on the running event loop"""
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background worker"""
+        if self._worker:
+            self._worker.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._worker
+
+    async def submit(self, prompt: str, **params) -> str:
+        """Queue a prompt and wait for its generated text"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((prompt, params, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            deadline = loop.time() + self.window
+            while len(items) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Only requests with identical sampling settings can share a generate() call
+            groups: Dict[tuple, list] = {}
+            for prompt, params, future in items:
+                groups.setdefault(tuple(sorted(params.items())), []).append((prompt, future))
+
+            for key, group in groups.items():
+                prompts = [prompt for prompt, _ in group]
+                try:
+                    results = await asyncio.to_thread(_generate_batch_with_model, prompts, **dict(key))
+                except Exception as e:
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future), result in zip(group, results):
+                    if not future.done():
+                        future.set_result(result)
+
+def prepare_engine(model_id: str = None):
+    """
+    Start a vLLM AsyncLLMEngine so concurrent requests are batched together.
+    """
+    global ENGINE
+    if ENGINE is not None:
+        return
+
+    model_id = model_id or os.getenv("MODEL_ID")
+    if not model_id:
+        raise ValueError("MODEL_ID environment variable is not set")
+
+    # Prompt builders truncate diffs by token count, which needs the tokenizer
+    prepare_tokenizer(model_id)
+
+    from vllm import AsyncEngineArgs, AsyncLLMEngine
+    ENGINE = AsyncLLMEngine.from_engine_args(AsyncEngineArgs(
+        model=model_id,
+        # Same weight dtype as the transformers backend (bfloat16 on Ampere+)
+        dtype=str(_select_dtype()).removeprefix("torch."),
+        gpu_memory_utilization=0.9,
+        max_num_batched_tokens=8192,
+        # Commit/PR prompts share a static prefix (and often a PR template); reuse its KV blocks
+        enable_prefix_caching=True,
+    ))
+    logger.info(f"vLLM engine started for {model_id}")
+
+async def _generate(prompt: str, max_new_tokens: int = 1000,
+                    do_sample: bool = True, top_p: float = 0.95,
+                    temperature: float = 0.7) -> str:
+    """Generate text with the configured backend without blocking the event loop"""
+    if BATCHER is not None:
+        return await BATCHER.submit(
+            prompt,
+            max_new_tokens=max_new_tokens,
+            do_sample=do_sample,
+            top_p=top_p,
+            temperature=temperature,
+        )
+    if ENGINE is None:
+        return await run_in_threadpool(
+            _generate_with_model, prompt, max_new_tokens, do_sample, top_p, temperature
+        )
+
+    final = None
+    # vLLM's scheduler batches all in-flight requests; we only need the last output
+    async for output in ENGINE.generate(prompt, _sampling_params(max_new_tokens, do_sample, top_p, temperature),
+                                        request_id=uuid4().hex):
+        final = output
+    if final is None or not final.outputs:
+        return ""
+    return final.outputs[0].text.strip()
+
+def _sampling_params(max_new_tokens: int, do_sample: bool, top_p: float, temperature: float):
+    """Translate the request's generation settings into vLLM SamplingParams"""
+    from vllm import SamplingParams
+    return SamplingParams(
+        max_tokens=max_new_tokens,
+        top_p=top_p if do_sample else 1.0,
+        temperature=temperature if do_sample else 0.0,
+    )
+
+def _sse_event(payload: Dict[str, Any]) -> str:
+    """Format a payload as a Server-Sent Events message"""
+    return f"data: {json.dumps(payload)}\n\n"
+
+async def _stream_engine(prompt: str, max_new_tokens: int, do_sample: bool,
+                         top_p: float, temperature: float):
+    """Yield SSE messages with the text vLLM adds at each step"""
+    sent = 0
+    async for output in ENGINE.generate(prompt, _sampling_params(max_new_tokens, do_sample, top_p, temperature),
+                                        request_id=uuid4().hex):
+        text = output.outputs[0].text if output.outputs else ""
+        if len(text) > sent:
+            yield _sse_event({"t": text[sent:]})
+            sent = len(text)
+
+def _stream(prompt: str, max_new_tokens: int, do_sample: bool, top_p: float, temperature: float):
+    """Stream generated text as SSE messages with the configured backend"""
+    if ENGINE is not None:
+        return _stream_engine(prompt, max_new_tokens, do_sample, top_p, temperature)
+    # Starlette iterates synchronous generators in its threadpool
+    return (_sse_event({"t": chunk}) for chunk in
+            _stream_with_model(prompt, max_new_tokens, do_sample, top_p, temperature))
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global BATCHER
     # Startup: Load model when the server starts
     logger.info("Loading model...")
-    prepare_model()
+    if MODEL_BACKEND == "vllm":
+        prepare_engine()
+    else:
+        prepare_model()
+        # Pay lazy CUDA init and kernel selection now instead of on the first request
+        warmup_model()
+        BATCHER = GenerationBatcher()
+        BATCHER.start()
     logger.info("Model loaded successfully")
-    
+
     yield
-    
-    # Shutdown: Any cleanup could go here if needed
+
+    # Shutdown: stop the batching worker
+    if BATCHER is not None:
+        await BATCHER.stop()
+        BATCHER = None
 
 app = FastAPI(title="BitJira-Lifter Model Server", lifespan=lifespan)
 
@@ -33,6 +212,7 @@ class GenerateRequest(BaseModel):
     do_sample: bool = True
     top_p: float = 0.95
     temperature: float = 0.7
+    stream: bool = False
 
 class CommitRequest(BaseModel):
     diff: str
@@ -49,10 +229,15 @@ def health_check():
     return {"status": "ok"}
 
 @app.post("/generate")
-def generate_text(req: GenerateRequest):
-    """Generate text based on prompt"""
+async def generate_text(req: GenerateRequest):
+    """Generate text based on prompt, optionally streamed as Server-Sent Events"""
+    if req.stream:
+        return StreamingResponse(
+            _stream(req.prompt, req.max_new_tokens, req.do_sample, req.top_p, req.temperature),
+            media_type="text/event-stream",
+        )
     try:
-        result = generate(
+        result = await _generate(
             prompt=req.prompt,
             max_new_tokens=req.max_new_tokens,
             do_sample=req.do_sample,
@@ -65,24 +250,21 @@ def generate_text(req: GenerateRequest):
         return {"error": str(e), "text": ""}
 
 @app.post("/commit")
-def commit_message(req: CommitRequest):
+async def commit_message(req: CommitRequest):
     """Generate commit message from diff and optional ticket"""
     try:
-        message = generate_commit_message(diff=req.diff, ticket=req.ticket)
+        message = await _generate(_build_commit_prompt(req.diff, req.ticket), max_new_tokens=150)
         return {"message": message}
     except Exception as e:
         logger.error(f"Error generating commit message: {e}")
         return {"error": str(e), "message": ""}
 
 @app.post("/pr")
-def pr_description(req: PRRequest):
+async def pr_description(req: PRRequest):
     """Generate PR description from ticket, diff and optional template"""
     try:
-        description = generate_pr_description(
-            ticket=req.ticket,
-            diff=req.diff,
-            template_path=req.template
-        )
+        prompt = _build_pr_prompt(req.ticket, req.diff, req.template)
+        description = await _generate(prompt, max_new_tokens=150)
         return {"description": description}
     except Exception as e:
         logger.error(f"Error generating PR description: {e}")
@@ -90,11 +272,17 @@ def pr_description(req: PRRequest):
 
 def start_server(host="127.0.0.1", port=8000):
     """Start the model server"""
-    uvicorn.run(app, host=host, port=port)
+    # "auto" picks uvloop and httptools (installed with uvicorn[standard]) and falls back to
+    # asyncio/h11 where they're unavailable. A single worker keeps one copy of the model in
+    # memory; concurrency comes from the request batcher instead of extra processes.
+    uvicorn.run(app, host=host, port=port, loop="auto", http="auto", workers=1)
 
 if __name__ == "__main__":
+    from utils.logging_config import configure as configure_logging
+    configure_logging()
+
     # Get host and port from environment or use defaults
     host = os.getenv("MODEL_SERVER_HOST", "127.0.0.1")
     port = int(os.getenv("MODEL_SERVER_PORT", "8000"))
-    
-    start_server(host, port) 
\ No newline at end of file
+
+    start_server(host, port)
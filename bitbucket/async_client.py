@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on in-flight requests per paginated walk
+MAX_CONCURRENT_REQUESTS = 64
+# How often a page is retried after a 429; the rate limiter holds the retry until Retry-After
+MAX_RATE_LIMIT_RETRIES = 3
+# Bitbucket's default page size is 10; 100 is the maximum most collections accept
+PAGE_LEN = 100
+
+async def _get_page(session: httpx.AsyncClient, url: str, sem: asyncio.Semaphore,
+                    params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Fetch one page of a Bitbucket collection.
+    
+    Args:
+        session: Async HTTP client
+        url: Collection URL (absolute, or relative to the client's base URL)
+        sem: Semaphore bounding concurrent requests
+        params: Optional query parameters
+        
+    Returns:
+        Decoded page JSON
+        
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    for _ in range(MAX_RATE_LIMIT_RETRIES):
+        async with sem:
+            response = await session.get(url, params=params)
+        if response.status_code != 429:
+            break
+    response.raise_for_status()
+    return response.json()
+
+async def paginate_all(url: str, session: httpx.AsyncClient,
+                       sem: Optional[asyncio.Semaphore] = None) -> List[Dict[str, Any]]:
+    """
+    Collect every value of a paginated Bitbucket collection.
+    
+    The first page is fetched alone to learn size/pagelen; the remaining pages are then
+    requested concurrently, bounded by the semaphore. Collections that don't report a
+    size are walked through their next links.
+    
+    Args:
+        url: Collection URL (absolute, or relative to the client's base URL)
+        session: Async HTTP client
+        sem: Semaphore bounding concurrent requests (default: MAX_CONCURRENT_REQUESTS)
+        
+    Returns:
+        List of all values across pages
+        
+    Raises:
+        httpx.HTTPError: If any page request fails
+    """
+    sem = sem or asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    data = await _get_page(session, url, sem, {"pagelen": PAGE_LEN})
+    values = list(data.get("values", []))
+
+    # The server may clamp pagelen, so page math uses the value it reports
+    size, pagelen = data.get("size"), data.get("pagelen")
+    if size and pagelen and size > pagelen:
+        pages = -(-size // pagelen)
+        results = await asyncio.gather(
+            *(_get_page(session, url, sem, {"page": page, "pagelen": pagelen})
+              for page in range(2, pages + 1))
+        )
+        for page in results:
+            values.extend(page.get("values", []))
+    else:
+        # next links already carry the page size
+        next_url = data.get("next")
+        while next_url:
+            page = await _get_page(session, next_url, sem)
+            values.extend(page.get("values", []))
+            next_url = page.get("next")
+
+    logger.debug(f"Fetched {len(values)} values from {url}")
+    return values
@@ -1,13 +1,17 @@
 import os
+import asyncio
 import logging
+import threading
+import httpx
 from typing import Generator, List, Dict, Optional, Any
+from urllib3.util.retry import Retry
 from atlassian.bitbucket import Cloud
 from atlassian.bitbucket.cloud.workspaces import Workspace
 from atlassian.bitbucket.cloud.workspaces import Projects
 from atlassian.bitbucket.cloud.repositories import Repository
+from bitbucket.async_client import paginate_all
+from bitbucket.rate_limiter import RateLimitedAdapter, rate_limiter
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Environment variables
@@ -15,12 +19,17 @@ BITBUCKET_USER = os.getenv("BITBUCKET_USER")
 BITBUCKET_APP_PASSWORD = os.getenv("BITBUCKET_APP_PASSWORD")
 BITBUCKET_WORKSPACE = os.getenv("BITBUCKET_WORKSPACE")
 
+BITBUCKET_API_URL = "https://api.bitbucket.org/2.0"
+
 bitbucket_client = None
+_bitbucket_client_lock = threading.Lock()
 
 def _get_bitbucket_client():
     global bitbucket_client
     if bitbucket_client is None:
-        bitbucket_client = _bitbucket_client()
+        with _bitbucket_client_lock:
+            if bitbucket_client is None:
+                bitbucket_client = _bitbucket_client()
     return bitbucket_client
 
 class BitbucketError(Exception):
@@ -35,7 +44,7 @@ def _bitbucket_client() -> Cloud:
         Bitbucket Cloud client instance
         
     Raises:
-        BitbucketError: If required environment variables are missing or authentication fails
+        BitbucketError: If required environment variables are missing or the client cannot be created
     """
     if not BITBUCKET_USER or not BITBUCKET_APP_PASSWORD:
         logger.error("Bitbucket credentials not set in environment variables")
@@ -48,8 +57,13 @@ def _bitbucket_client() -> Cloud:
             password=BITBUCKET_APP_PASSWORD,
             cloud=True
         )
-        # Test connection by making a simple request
-        client.workspaces.get_avatar(BITBUCKET_WORKSPACE)
+        # Keep a pool of keep-alive connections so calls reuse the TLS session, and back off
+        # on rate limiting and gateway errors. Retry's defaults leave POSTs alone.
+        # Requests are paced by the shared token bucket before they are sent.
+        retries = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+        client._session.mount("https://", RateLimitedAdapter(rate_limiter, pool_connections=10,
+                                                             pool_maxsize=64, max_retries=retries))
+        # No connection probe: auth problems surface on the first real API call
         return client
     except Exception as e:
         logger.error(f"Failed to initialize Bitbucket client: {e}")
@@ -65,14 +79,8 @@ def list_workspaces() -> List[Dict[str, Any]]:
     Raises:
         BitbucketError: If the API request fails
     """
-    try:
-        bb = _get_bitbucket_client()
-        workspaces = list(bb.workspaces.each())
-        logger.info(f"Found {len(workspaces)} Bitbucket workspaces")
-        return workspaces
-    except Exception as e:
-        logger.error(f"Error listing workspaces: {e}")
-        raise BitbucketError(f"Error listing workspaces: {str(e)}") from e
+    # Pages are fetched concurrently instead of walking .each() one page at a time
+    return asyncio.run(list_workspaces_async())
 
 def get_workspace(workspace_slug: str = BITBUCKET_WORKSPACE) -> Workspace:
     """
@@ -104,6 +112,87 @@ def list_projects(workspace_slug: str = BITBUCKET_WORKSPACE) -> List[Dict[str, A
     """
     List all projects in a workspace.
     
+    Args:
+        workspace_slug: The workspace slug containing the projects
+        
+    Returns:
+        List of project dictionaries
+        
+    Raises:
+        BitbucketError: If the API request fails
+    """
+    return asyncio.run(list_projects_async(workspace_slug))
+
+def list_repos(workspace_slug: str = BITBUCKET_WORKSPACE) -> List[Dict[str, Any]]:
+    """
+    List all repositories in a workspace.
+    
+    Args:
+        workspace_slug: The workspace slug containing the repositories
+        
+    Returns:
+        List of repository dictionaries
+        
+    Raises:
+        BitbucketError: If the API request fails
+    """
+    return asyncio.run(list_repos_async(workspace_slug))
+
+def _async_bitbucket_client() -> httpx.AsyncClient:
+    """
+    Create an async HTTP client for the Bitbucket REST API.
+    
+    Returns:
+        httpx.AsyncClient authenticated with the Bitbucket app password
+        
+    Raises:
+        BitbucketError: If required environment variables are missing
+    """
+    if not BITBUCKET_USER or not BITBUCKET_APP_PASSWORD:
+        logger.error("Bitbucket credentials not set in environment variables")
+        raise BitbucketError(
+            "Please set BITBUCKET_USER and BITBUCKET_APP_PASSWORD environment variables.")
+
+    async def _before_request(request: httpx.Request):
+        await rate_limiter.acquire()
+
+    async def _after_response(response: httpx.Response):
+        rate_limiter.update(response.status_code, response.headers)
+
+    return httpx.AsyncClient(
+        auth=(BITBUCKET_USER, BITBUCKET_APP_PASSWORD),
+        base_url=BITBUCKET_API_URL,
+        http2=True,
+        timeout=30.0,
+        # Share the token bucket with the sync client
+        event_hooks={"request": [_before_request], "response": [_after_response]}
+    )
+
+async def list_workspaces_async() -> List[Dict[str, Any]]:
+    """
+    List all workspaces accessible to the authenticated user, fetching pages concurrently.
+    
+    Returns:
+        List of workspace dictionaries
+        
+    Raises:
+        BitbucketError: If the API request fails
+    """
+    try:
+        async with _async_bitbucket_client() as client:
+            workspaces = await paginate_all("/workspaces", client)
+        logger.info(f"Found {len(workspaces)} Bitbucket workspaces")
+        return workspaces
+    except BitbucketError:
+        raise
+    except Exception as e:
+        logger.error(f"Error listing workspaces: {e}")
+        raise BitbucketError(f"Error listing workspaces: {str(e)}") from e
+
+async def list_projects_async(workspace_slug: str = BITBUCKET_WORKSPACE) -> List[Dict[str, Any]]:
+    """
+    List all projects in a workspace, fetching pages concurrently.
+    
     Args:
         workspace_slug: The workspace slug containing the projects
         
@@ -116,19 +205,21 @@ def list_projects(workspace_slug: str = BITBUCKET_WORKSPACE) -> List[Dict[str, A
     if not workspace_slug:
         logger.error("No workspace slug provided and BITBUCKET_WORKSPACE not set")
         raise BitbucketError("No workspace slug provided")
-        
+
     try:
-        bb = _get_bitbucket_client()
-        projects = list(bb.workspaces.get(workspace_slug).projects.each())
+        async with _async_bitbucket_client() as client:
+            projects = await paginate_all(f"/workspaces/{workspace_slug}/projects", client)
         logger.info(f"Found {len(projects)} projects in workspace {workspace_slug}")
         return projects
+    except BitbucketError:
+        raise
     except Exception as e:
         logger.error(f"Error listing projects in workspace {workspace_slug}: {e}")
         raise BitbucketError(f"Error listing projects in workspace {workspace_slug}: {str(e)}") from e
 
-def list_repos(workspace_slug: str = BITBUCKET_WORKSPACE) -> List[Dict[str, Any]]:
+async def list_repos_async(workspace_slug: str = BITBUCKET_WORKSPACE) -> List[Dict[str, Any]]:
     """
-    List all repositories in a workspace.
+    List all repositories in a workspace, fetching pages concurrently.
     
     Args:
         workspace_slug: The workspace slug containing the repositories
@@ -142,16 +233,29 @@ def list_repos(workspace_slug: str = BITBUCKET_WORKSPACE) -> List[Dict[str, Any]
     if not workspace_slug:
         logger.error("No workspace slug provided and BITBUCKET_WORKSPACE not set")
         raise BitbucketError("No workspace slug provided")
-        
+
     try:
-        bb = _get_bitbucket_client()
-        repos = list(bb.workspaces.get(workspace_slug).repositories.each())
+        async with _async_bitbucket_client() as client:
+            repos = await paginate_all(f"/repositories/{workspace_slug}", client)
         logger.info(f"Found {len(repos)} repositories in workspace {workspace_slug}")
         return repos
+    except BitbucketError:
+        raise
     except Exception as e:
         logger.error(f"Error listing repositories in workspace {workspace_slug}: {e}")
         raise BitbucketError(f"Error listing repositories in workspace {workspace_slug}: {str(e)}") from e
 
+def _repo_url(workspace_slug: str, repo_slug: str) -> str:
+    """Absolute API URL of a repository"""
+    return f"{BITBUCKET_API_URL}/repositories/{workspace_slug}/{repo_slug}"
+
+def _error_message(response) -> str:
+    """Bitbucket's own error text for a failed response, falling back to the HTTP status"""
+    try:
+        return response.json()["error"]["message"]
+    except (ValueError, KeyError, TypeError):
+        return f"{response.status_code} {response.reason}"
+
 def get_repo(repo_slug: str, workspace_slug: str = BITBUCKET_WORKSPACE) -> Repository:
     """
     Get a specific repository by slug.
@@ -176,7 +280,8 @@ def get_repo(repo_slug: str, workspace_slug: str = BITBUCKET_WORKSPACE) -> Repos
         
     try:
         bb = _get_bitbucket_client()
-        repo = bb.workspaces.get(workspace_slug).repositories.get(repo_slug)
+        # One GET on /repositories/{workspace}/{repo}, not a workspace fetch followed by the repo
+        repo = bb.repositories.get(workspace_slug, repo_slug)
         logger.info(f"Retrieved repository: {repo_slug} in workspace {workspace_slug}")
         return repo
     except Exception as e:
@@ -214,7 +319,6 @@ def create_pull_request(
         
     try:
         bb = _get_bitbucket_client()
-        repo = bb.workspaces.get(workspace_slug).repositories.get(repo_slug)
         
         # Create PR
         pr_data = {
@@ -224,7 +328,13 @@ def create_pull_request(
             "destination": {"branch": {"name": destination_branch}}
         }
         
-        pr = repo.pullrequests.create(pr_data)
+        # POST straight to the pull request endpoint; going through the workspace and
+        # repository objects first costs two extra GETs
+        response = bb._session.post(_repo_url(workspace_slug, repo_slug) + "/pullrequests",
+                                    json=pr_data, timeout=bb.timeout)
+        if not response.ok:
+            raise BitbucketError(_error_message(response))
+        pr = response.json()
         logger.info(f"Created PR: {title} in {repo_slug}")
         return pr
     except Exception as e:
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Mapping, Optional
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Bucket size and refill rate for outbound Bitbucket requests
+RATE_LIMIT_CAPACITY = 50
+RATE_LIMIT_REFILL_PER_SEC = 4.0
+
+class RateLimiter:
+    """Token bucket shared by the sync and async Bitbucket clients"""
+
+    def __init__(self, capacity: int = RATE_LIMIT_CAPACITY, refill_rate: float = RATE_LIMIT_REFILL_PER_SEC):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        # Set from Retry-After on a 429; nothing is sent before then
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait before sending"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+            self._updated = now
+            # Going negative queues callers behind each other instead of letting them race
+            self._tokens -= 1
+            delay = -self._tokens / self.refill_rate if self._tokens < 0 else 0.0
+            return max(delay, self._blocked_until - now)
+
+    def acquire_sync(self):
+        """Block the current thread until a request may be sent"""
+        delay = self._reserve()
+        if delay > 0:
+            logger.debug(f"Rate limited, waiting {delay:.2f}s")
+            time.sleep(delay)
+
+    async def acquire(self):
+        """Wait, without blocking the event loop, until a request may be sent"""
+        delay = self._reserve()
+        if delay > 0:
+            logger.debug(f"Rate limited, waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    def update(self, status_code: int, headers: Mapping[str, str]):
+        """
+        Adjust the bucket from a response's rate-limit headers.
+
+        Args:
+            status_code: HTTP status of the response
+            headers: Response headers
+        """
+        remaining = _header_number(headers, "X-RateLimit-Remaining")
+        retry_after = _header_number(headers, "Retry-After")
+        with self._lock:
+            if remaining is not None:
+                # The server's count wins when it is lower than ours
+                self._tokens = min(self._tokens, remaining)
+            if status_code == 429:
+                self._tokens = min(self._tokens, 0.0)
+                if retry_after is not None:
+                    self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                    logger.warning(f"Bitbucket rate limit hit, pausing requests for {retry_after:.0f}s")
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    """Parse a numeric header, or return None if it is missing or not a number"""
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+class RateLimitedAdapter(HTTPAdapter):
+    """HTTPAdapter that takes a token before each request and reads limits from each response"""
+
+    def __init__(self, limiter: RateLimiter, *args, **kwargs):
+        self.limiter = limiter
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, *args, **kwargs):
+        self.limiter.acquire_sync()
+        response = super().send(request, *args, **kwargs)
+        self.limiter.update(response.status_code, response.headers)
+        return response
+
+# Process-wide limiter for api.bitbucket.org
+rate_limiter = RateLimiter()
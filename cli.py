@@ -1,31 +1,37 @@
 import logging
-
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
-logging.getLogger().setLevel(logging.WARNING)
-
 import os
+import re
 import typer
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
+from utils.logging_config import configure as configure_logging
 
-# Load environment variables
-try:
-    from dotenv import load_dotenv
-    load_dotenv(override=True)
-    logger.info("Environment variables loaded")
-except ImportError:
-    logger.warning("dotenv not installed, using existing environment variables")
-
-# Import the client implementation instead of direct generator
-from ai.client import generate as client_generate, generate_commit_message, generate_pr_description
-from git.git_utils import get_staged_diff, commit_with_message, GitError, current_branch, get_diff_to_target_branch
-from jira.branch_helper import create_branch, find_branches, JiraError
-from bitbucket.cloud_helper import create_pull_request, BitbucketError
+logger = logging.getLogger(__name__)
 
+# Heavy modules (atlassian, deep_translator, the AI client) are imported inside the
+# commands that use them so that each subcommand only pays for what it needs.
 app = typer.Typer(help="BitJira Lifter: CLI tool for AI-driven Git and Jira workflow")
 
+# Jira ticket ID embedded in a branch name, e.g. feature/ABC-123-short-desc
+_TICKET_RE = re.compile(r'[A-Z]+-\d+')
+
+@app.callback()
+def main(
+    no_dotenv: bool = typer.Option(False, "--no-dotenv", help="Skip loading variables from .env")
+):
+    """
+    Load environment variables before any command runs.
+    """
+    if no_dotenv:
+        return
+    # Load environment variables; values already exported take precedence over .env
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(override=False)
+        logger.info("Environment variables loaded")
+    except ImportError:
+        logger.warning("dotenv not installed, using existing environment variables")
+
 @app.command()
 def server(
     host: str = typer.Option("127.0.0.1", help="Host address to bind the server to"),
@@ -82,6 +88,7 @@ def generate(
     """
     Generate text using the model.
     """
+    from ai.client import generate as client_generate
     # The client will automatically check if the server is running and fall back if needed
     result = client_generate(prompt, max_new_tokens, do_sample, top_p, temperature)
     print(result)
@@ -94,6 +101,8 @@ def ai_commit(
     """
     Generate a commit message via AI and commit.
     """
+    from ai.client import generate_commit_message, forget_commit_message
+    from git.git_utils import get_staged_diff, commit_with_message, GitError
     try:
         diff = get_staged_diff()
         if not diff:
@@ -113,6 +122,8 @@ def ai_commit(
         
         # Confirm
         if not force and not typer.confirm("Proceed with commit?"):
+            # Don't offer the rejected message again on the next run
+            forget_commit_message(diff, ticket)
             typer.echo("Commit cancelled.")
             return
             
@@ -140,6 +151,8 @@ def ai_pr(
     """
     Generate a PR description for the given ticket.
     """
+    from ai.client import generate_pr_description
+    from git.git_utils import get_diff_to_target_branch
     try:
         # Ensure template exists
         if not Path(template).exists():
@@ -181,18 +194,20 @@ def ai_pr(
 def branch(
     ticket: str = typer.Argument(..., help="Jira ticket ID"), 
     branch_type: str = typer.Option("feature", help="Branch type (feature, bugfix, etc.)"),
-    mine: bool = typer.Option(False, help="Only tickets assigned to me")
+    mine: bool = typer.Option(False, help="Only tickets assigned to me"),
+    refresh: bool = typer.Option(False, "--refresh", help="Fetch the ticket from Jira even if it is cached")
 ):
     """
     Create or find a branch for a given Jira ticket.
     """
+    from jira.branch_helper import create_branch, JiraError
     try:
         if mine:
             # logic to verify assignment can be added later
             typer.echo("Checking for ticket assignment...")
             
         typer.echo(f"Creating branch for ticket {ticket}...")
-        branch_name = create_branch(ticket, branch_type)
+        branch_name = create_branch(ticket, branch_type, refresh=refresh)
         typer.secho(f"Using branch: {branch_name}", fg=typer.colors.GREEN)
         
     except JiraError as e:
@@ -200,6 +215,29 @@ def branch(
     except Exception as e:
         typer.secho(f"Unexpected error: {str(e)}", fg=typer.colors.RED)
 
+@app.command()
+def branches(
+    tickets: List[str] = typer.Argument(..., help="Jira ticket IDs"),
+    branch_type: str = typer.Option("feature", help="Branch type (feature, bugfix, etc.)")
+):
+    """
+    Create branches for several Jira tickets without checking them out.
+    """
+    from jira.branch_helper import create_branches, JiraError
+    try:
+        typer.echo(f"Creating branches for {len(tickets)} tickets...")
+        created = create_branches(tickets, branch_type)
+        for ticket in dict.fromkeys(tickets):
+            if ticket in created:
+                typer.secho(f"{ticket}: {created[ticket]}", fg=typer.colors.GREEN)
+            else:
+                typer.secho(f"{ticket}: failed to create branch", fg=typer.colors.RED)
+                
+    except JiraError as e:
+        typer.secho(f"Jira error: {str(e)}", fg=typer.colors.RED)
+    except Exception as e:
+        typer.secho(f"Unexpected error: {str(e)}", fg=typer.colors.RED)
+
 @app.command()
 def list_branches(
     ticket: Optional[str] = typer.Option(None, help="Filter by ticket ID")
@@ -207,6 +245,7 @@ def list_branches(
     """
     List existing branches related to your tickets.
     """
+    from jira.branch_helper import find_branches
     try:
         branches = find_branches(ticket)
         
@@ -235,10 +274,21 @@ def create_pr(
     """
     Create a pull request on Bitbucket.
     """
+    from ai.client import generate_pr_description
+    from git.git_utils import GitError, current_branch, get_diff_to_target_branch
+    from jira.branch_helper import JiraError
+    from bitbucket.cloud_helper import create_pull_request, BitbucketError
+    from concurrent.futures import ThreadPoolExecutor
+    # The branch lookup and the diff don't depend on each other; start both up front
+    executor = ThreadPoolExecutor(max_workers=2)
     try:
+        branch_future = None if source else executor.submit(current_branch)
+        # The diff is only used for a description, which needs a ticket
+        diff_future = executor.submit(get_diff_to_target_branch) if create_desc and ticket else None
+
         # Get current branch if source not provided
         if not source:
-            source = current_branch()
+            source = branch_future.result()
             if not source:
                 typer.secho("Could not determine current branch.", fg=typer.colors.RED)
                 return
@@ -246,11 +296,12 @@ def create_pr(
             
         # Extract ticket ID from branch if not provided
         if not ticket:
-            import re
-            match = re.search(r'[A-Z]+-\d+', source)
+            match = _TICKET_RE.search(source)
             if match:
                 ticket = match.group(0)
                 typer.echo(f"Extracted ticket ID from branch: {ticket}")
+                if create_desc:
+                    diff_future = executor.submit(get_diff_to_target_branch)
             else:
                 typer.secho("Could not extract ticket ID from branch name. Please provide it explicitly.", fg=typer.colors.YELLOW)
                 
@@ -264,7 +315,7 @@ def create_pr(
         if create_desc and ticket:
             try:
                 typer.echo(f"Generating description for ticket {ticket}...")
-                diff = get_diff_to_target_branch()
+                diff = diff_future.result()
                 template_path = "templates/pr_template"
                 if not Path(template_path).exists():
                     template_path = "templates/pr_template.example"
@@ -305,6 +356,12 @@ def create_pr(
         typer.secho(f"Error: {str(e)}", fg=typer.colors.RED)
     except Exception as e:
         typer.secho(f"Unexpected error: {str(e)}", fg=typer.colors.RED)
+    finally:
+        # Return without blocking on a diff that is still running; its worker thread is
+        # still joined at interpreter exit
+        executor.shutdown(wait=False)
 
 if __name__ == "__main__":
+    # Keep library chatter out of the terminal; commands report through typer
+    configure_logging(logging.WARNING)
     app()
\ No newline at end of file
@@ -1,21 +1,80 @@
+import os
+import functools
 import subprocess
 import logging
-from typing import List, Optional, Tuple, Union
+from typing import Iterator, List, Optional, Tuple, Union
+
+# libgit2 bindings let read-only queries run in-process instead of spawning git
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class GitError(Exception):
     """Exception raised for Git command errors."""
     pass
 
-def run_cmd(cmd: list) -> str:
+class GitSession:
+    """In-process handle on the current repository, backed by libgit2."""
+
+    def __init__(self, path: str):
+        self.repo = pygit2.Repository(path)
+
+    def staged_diff(self, max_bytes: Optional[int] = None) -> str:
+        """Diff between HEAD and the index, byte for byte what `git diff --staged` with DIFF_FLAGS prints."""
+        # Pick up index changes made by git commands since the last read
+        self.repo.index.read(False)
+        head = self.repo.revparse_single("HEAD").peel(pygit2.Tree)
+        # Positional (flags, context_lines, interhunk_lines): Repository.diff(cached=True)
+        # and keyword arguments to diff_to_index drop context_lines
+        diff = head.diff_to_index(self.repo.index, pygit2.enums.DiffOption.PATIENCE, 0, 0)
+        # Cap the raw bytes, then decode, exactly like the git CLI path
+        patch = b"".join(p.data for p in diff)
+        return patch[:max_bytes].decode("utf-8", errors="replace").strip()
+
+    def local_branches(self) -> List[str]:
+        """Names of all local branches."""
+        return list(self.repo.branches.local)
+
+    def current_branch(self) -> Optional[str]:
+        """Short name of HEAD, or None when detached (matching `git symbolic-ref --short -q`)."""
+        if self.repo.head_is_detached:
+            return None
+        return self.repo.head.shorthand
+
+@functools.lru_cache(maxsize=1)
+def _git_session() -> Optional[GitSession]:
+    """
+    Open the repository containing the working directory once per process.
+    
+    Returns:
+        GitSession, or None if pygit2 is not installed or no repository is found
+    """
+    if pygit2 is None:
+        return None
+    try:
+        path = pygit2.discover_repository(os.getcwd())
+        return GitSession(path) if path else None
+    except Exception as e:
+        logger.warning(f"Failed to open repository with pygit2, using git CLI: {e}")
+        return None
+
+# Diff flags for output fed to the model: no context lines, colour or external diff drivers.
+# patience is the algorithm libgit2 also offers, so GitSession.staged_diff produces the same text
+DIFF_FLAGS = ["--no-color", "--no-ext-diff", "-U0", "--diff-algorithm=patience"]
+
+# Cap on diff size handed to the model; it only sees a few thousand tokens anyway
+MAX_DIFF_BYTES = 64_000
+
+def run_cmd(cmd: list, max_bytes: Optional[int] = None) -> str:
     """
     Run a git command and return stdout.
     
     Args:
         cmd: List of command components
+        max_bytes: Truncate output to this many bytes before decoding
         
     Returns:
         Command output as string
@@ -24,10 +83,12 @@ def run_cmd(cmd: list) -> str:
         GitError: If the command fails with non-zero exit code
     """
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        return result.stdout.strip()
+        # Decode once as UTF-8 rather than through the locale's incremental text decoder
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        return result.stdout[:max_bytes].decode("utf-8", errors="replace").strip()
     except subprocess.CalledProcessError as e:
-        error_msg = f"Error executing command '{' '.join(cmd)}': {e.stderr.strip()}"
+        stderr = e.stderr.decode("utf-8", errors="replace").strip()
+        error_msg = f"Error executing command '{' '.join(cmd)}': {stderr}"
         logger.error(error_msg)
         raise GitError(error_msg) from e
     except Exception as e:
@@ -35,24 +96,89 @@ def run_cmd(cmd: list) -> str:
         logger.error(error_msg)
         raise GitError(error_msg) from e
 
-def get_staged_diff() -> str:
+def invalidate_git_cache():
+    """
+    Drop cached repository state after a command that changes branches, HEAD or the index.
+    """
+    is_repo_clean.cache_clear()
+    _local_branches.cache_clear()
+    current_branch.cache_clear()
+
+def get_staged_diff(max_bytes: int = MAX_DIFF_BYTES) -> str:
     """
-    Get the diff of staged changes.
+    Get the diff of staged changes, without context lines.
     
+    Args:
+        max_bytes: Truncate the diff to this many bytes
+        
     Returns:
         Git diff output as string
         
     Raises:
         GitError: If git diff command fails
     """
-    return run_cmd(["git", "diff", "--staged"])
+    session = _git_session()
+    if session is not None:
+        try:
+            return session.staged_diff(max_bytes)
+        except Exception as e:
+            logger.debug(f"pygit2 staged diff failed, using git CLI: {e}")
+    # Stop reading at the cap instead of buffering the whole diff first
+    return "".join(iter_staged_diff_lines(max_bytes)).strip()
 
-def get_diff_to_target_branch(target_branch: str = "dev") -> str:
+def iter_staged_diff_lines(max_bytes: Optional[int] = MAX_DIFF_BYTES) -> Iterator[str]:
     """
-    Get the diff of changes compared to the target branch.
+    Stream the staged diff line by line as git produces it.
+    
+    git is stopped as soon as max_bytes have been read, so a huge diff is never
+    held in memory in full.
+    
+    Args:
+        max_bytes: Stop after this many bytes, or None to read everything
+        
+    Yields:
+        Diff lines, including their line endings
+        
+    Raises:
+        GitError: If git diff command fails
+    """
+    cmd = ["git", "--no-pager", "diff", "--staged", *DIFF_FLAGS]
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except OSError as e:
+        error_msg = f"Unexpected error executing command '{' '.join(cmd)}': {str(e)}"
+        logger.error(error_msg)
+        raise GitError(error_msg) from e
+
+    finished = False
+    remaining = max_bytes
+    try:
+        for line in proc.stdout:
+            if remaining is not None:
+                if len(line) >= remaining:
+                    yield line[:remaining].decode("utf-8", errors="replace")
+                    return
+                remaining -= len(line)
+            yield line.decode("utf-8", errors="replace")
+        finished = True
+    finally:
+        if not finished:
+            # Cap reached or the consumer stopped early
+            proc.kill()
+        _, stderr = proc.communicate()
+
+    if proc.returncode != 0:
+        error_msg = f"Error executing command '{' '.join(cmd)}': {stderr.decode('utf-8', errors='replace').strip()}"
+        logger.error(error_msg)
+        raise GitError(error_msg)
+
+def get_diff_to_target_branch(target_branch: str = "dev", max_bytes: int = MAX_DIFF_BYTES) -> str:
+    """
+    Get the diff of changes compared to the target branch, without context lines.
     
     Args:
         target_branch: Target branch to compare against, defaults to "dev"
+        max_bytes: Truncate the diff to this many bytes
         
     Returns:
         Git diff output as string
@@ -60,12 +186,15 @@ def get_diff_to_target_branch(target_branch: str = "dev") -> str:
     Raises:
         GitError: If git diff command fails
     """
-    return run_cmd(["git", "diff", target_branch])
+    return run_cmd(["git", "--no-pager", "diff", *DIFF_FLAGS, target_branch], max_bytes)
 
+@functools.lru_cache(maxsize=1)
 def is_repo_clean() -> bool:
     """
     Check if the repository has any uncommitted changes.
     
+    The result is cached until invalidate_git_cache() is called.
+    
     Returns:
         True if the repository is clean, False otherwise
     """
@@ -91,23 +220,49 @@ def commit_with_message(message: str) -> bool:
     except GitError:
         logger.error("Failed to commit changes")
         return False
+    finally:
+        invalidate_git_cache()
 
-def list_local_branches() -> List[str]:
+def list_local_branches(pattern: Optional[str] = None) -> List[str]:
     """
-    List all local branches.
+    List local branches, optionally only those whose name contains pattern.
+    
+    Matching is case-insensitive. The result is cached until invalidate_git_cache() is called.
     
+    Args:
+        pattern: Optional substring (e.g. a Jira ticket ID) to filter branch names by
+        
     Returns:
         List of branch names
         
     Raises:
-        GitError: If git branch command fails
+        GitError: If git for-each-ref command fails
     """
+    # Copy so callers can't mutate the cached snapshot
+    return list(_local_branches(pattern))
+
+@functools.lru_cache(maxsize=32)
+def _local_branches(pattern: Optional[str] = None) -> Tuple[str, ...]:
+    session = _git_session()
+    if session is not None:
+        try:
+            # Filtering the in-process listing is cheaper than spawning git
+            branches = session.local_branches()
+            if pattern:
+                needle = pattern.lower()
+                branches = [b for b in branches if needle in b.lower()]
+            return tuple(branches)
+        except Exception as e:
+            logger.debug(f"pygit2 branch listing failed, using git CLI: {e}")
     try:
-        output = run_cmd(["git", "branch"])
-        return [line.strip().lstrip("* ") for line in output.splitlines()]
+        # for-each-ref prints bare ref names, so there is no "* " marker or padding to strip.
+        # With a pattern git matches the refs itself; "**/" also matches branches without a prefix
+        refs = f"refs/heads/**/*{pattern}*" if pattern else "refs/heads"
+        output = run_cmd(["git", "for-each-ref", "--ignore-case", "--format=%(refname:short)", refs])
+        return tuple(output.splitlines())
     except GitError:
         logger.error("Failed to list local branches")
-        return []
+        return ()
 
 def checkout_branch(name: str, create_new: bool = False) -> bool:
     """
@@ -132,19 +287,57 @@ def checkout_branch(name: str, create_new: bool = False) -> bool:
     except GitError:
         logger.error(f"Failed to checkout branch '{name}'")
         return False
+    finally:
+        invalidate_git_cache()
 
+def create_local_branch(name: str) -> bool:
+    """
+    Create a branch at HEAD without checking it out.
+    
+    Args:
+        name: Branch name
+        
+    Returns:
+        True if the branch was created, False otherwise
+    """
+    try:
+        run_cmd(["git", "branch", name])
+        return True
+    except GitError:
+        logger.error(f"Failed to create branch '{name}'")
+        return False
+    finally:
+        invalidate_git_cache()
+
+@functools.lru_cache(maxsize=1)
 def current_branch() -> Optional[str]:
     """
     Get the name of the current branch.
     
+    The result is cached until invalidate_git_cache() is called.
+    
     Returns:
-        Current branch name or None if error
+        Current branch name, or None if HEAD is detached or on error
     """
+    session = _git_session()
+    if session is not None:
+        try:
+            return session.current_branch()
+        except Exception as e:
+            logger.debug(f"pygit2 HEAD lookup failed, using git CLI: {e}")
     try:
-        return run_cmd(["git", "rev-parse", "--abbrev-ref", "HEAD"])
-    except GitError:
+        # Not run_cmd: with -q a detached HEAD is a silent exit 1, not an error to log
+        result = subprocess.run(["git", "symbolic-ref", "--short", "-q", "HEAD"], capture_output=True)
+    except OSError:
         logger.error("Failed to get current branch name")
         return None
+    if result.returncode == 1:
+        logger.debug("HEAD is detached")
+        return None
+    if result.returncode != 0:
+        logger.error("Failed to get current branch name")
+        return None
+    return result.stdout.decode("utf-8", errors="replace").strip() or None
 
 def pull_latest() -> bool:
     """
@@ -158,4 +351,6 @@ def pull_latest() -> bool:
         return True
     except GitError:
         logger.error("Failed to pull latest changes")
-        return False 
\ No newline at end of file
+        return False
+    finally:
+        invalidate_git_cache() 
\ No newline at end of file
@@ -1,12 +1,16 @@
 import os
 import logging
 import re
-from typing import List, Optional
+import string
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 from atlassian import Jira
-from deep_translator import GoogleTranslator
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from unidecode import unidecode
+from utils.disk_cache import open_disk_cache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Environment variables
@@ -14,12 +18,29 @@ JIRA_URL = os.getenv("JIRA_URL")
 JIRA_USER = os.getenv("JIRA_USER")
 JIRA_TOKEN = os.getenv("JIRA_TOKEN")
 
+# Ticket summaries are cached in-process for five minutes and, when diskcache is installed,
+# on disk for an hour so switching back to a ticket doesn't cost another Jira round trip
+SUMMARY_CACHE_TTL = 3600
+SUMMARY_MEMORY_TTL = 300
+SUMMARY_MEMORY_SIZE = 256
+# Tickets per JQL "key in (...)" query when fetching summaries in bulk
+JQL_BATCH_SIZE = 100
+
+# Jira ticket ID, e.g. ABC-123
+_VALID_TICKET_RE = re.compile(r'^[A-Z]+-\d+$')
+
 jira_client = None
+_jira_client_lock = threading.Lock()
+_summary_cache = TTLCache(maxsize=SUMMARY_MEMORY_SIZE, ttl=SUMMARY_MEMORY_TTL)
+# TTLCache isn't thread-safe and create_branches looks tickets up concurrently
+_summary_cache_lock = threading.Lock()
 
 def _get_jira_client():
     global jira_client
     if jira_client is None:
-        jira_client = _jira_client()
+        with _jira_client_lock:
+            if jira_client is None:
+                jira_client = _jira_client()
     return jira_client
 
 class JiraError(Exception):
@@ -34,20 +55,142 @@ def _jira_client() -> Jira:
         Jira client instance
         
     Raises:
-        JiraError: If required environment variables are missing or authentication fails
+        JiraError: If required environment variables are missing or the client cannot be created
     """
     if not all([JIRA_URL, JIRA_USER, JIRA_TOKEN]):
         raise JiraError("Please set JIRA_URL, JIRA_USER, and JIRA_TOKEN environment variables.")
     
     try:
         client = Jira(url=JIRA_URL, username=JIRA_USER, password=JIRA_TOKEN)
-        # Test the connection by making a simple request
-        client.get_server_info()
+        # Keep-alive connection pool on the client's authenticated session. There is no
+        # connection probe: auth problems surface on the first real API call
+        client._session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
         return client
     except Exception as e:
         logger.error(f"Failed to initialize Jira client: {e}")
         raise JiraError(f"Failed to initialize Jira client: {str(e)}") from e
 
+def _ticket_branch_pattern(ticket: str) -> "re.Pattern[str]":
+    """Match ticket as a whole path component prefix: ABC-1 matches feature/ABC-1-foo but not feature/ABC-12-foo"""
+    return re.compile(rf'(^|/){re.escape(ticket)}(-|$)', re.IGNORECASE)
+
+def _valid_ticket(ticket: Optional[str]) -> bool:
+    """Whether ticket looks like a Jira ticket ID (ABC-123)"""
+    return bool(ticket) and _VALID_TICKET_RE.match(ticket) is not None
+
+def _get_summary_disk_cache():
+    """The persistent summary cache, or None if diskcache is unavailable"""
+    return open_disk_cache("jira")
+
+def get_issue_summary(ticket: str, refresh: bool = False) -> str:
+    """
+    Get the summary of a Jira ticket, using the local cache when possible.
+    
+    Args:
+        ticket: Jira ticket ID
+        refresh: Skip the cache and fetch the summary from Jira again
+        
+    Returns:
+        Ticket summary, or an empty string if the ticket has none
+        
+    Raises:
+        JiraError: If the Jira client cannot be created
+    """
+    if not refresh:
+        # Hit: no disk cache or Jira client needed
+        with _summary_cache_lock:
+            summary = _summary_cache.get(ticket)
+        if summary is not None:
+            return summary
+
+    disk_cache = _get_summary_disk_cache()
+    if not refresh and disk_cache is not None:
+        summary = disk_cache.get(ticket)
+        if summary is not None:
+            with _summary_cache_lock:
+                _summary_cache[ticket] = summary
+            return summary
+
+    summary = _fetch_issue_summary(ticket)
+    _remember_summary(ticket, summary)
+    return summary
+
+def _remember_summary(ticket: str, summary: str):
+    """Store a fetched summary in the in-process and disk caches"""
+    # Don't pin an empty summary; it may be filled in later
+    if not summary:
+        return
+    with _summary_cache_lock:
+        _summary_cache[ticket] = summary
+    disk_cache = _get_summary_disk_cache()
+    if disk_cache is not None:
+        disk_cache.set(ticket, summary, expire=SUMMARY_CACHE_TTL)
+
+def _batch_fetch_summaries(tickets: List[str]) -> Dict[str, str]:
+    """
+    Fetch the summaries of many tickets with JQL "key in (...)" queries instead of one request each.
+    
+    Args:
+        tickets: Jira ticket IDs; malformed IDs are skipped
+        
+    Returns:
+        Mapping of ticket ID to summary for the tickets Jira returned
+    """
+    # Only well-formed keys go into the JQL; Jira rejects the whole query otherwise
+    keys = [ticket for ticket in tickets if _valid_ticket(ticket)]
+    summaries: Dict[str, str] = {}
+    for start in range(0, len(keys), JQL_BATCH_SIZE):
+        batch = keys[start:start + JQL_BATCH_SIZE]
+        try:
+            jira = _get_jira_client()
+            result = jira.jql(f"key in ({','.join(batch)})", fields="summary", limit=len(batch))
+        except Exception as e:
+            # e.g. a deleted ticket fails the whole query; callers fall back to single lookups
+            logger.warning(f"Batch fetch of Jira tickets failed: {e}")
+            continue
+        for issue in result.get('issues', []):
+            summaries[issue['key']] = issue.get('fields', {}).get('summary', '') or ''
+    return summaries
+
+def _fetch_issue_summary(ticket: str) -> str:
+    """Fetch a ticket's summary from Jira, bypassing the caches"""
+    jira = _get_jira_client()
+    # Only the summary is used; the full issue payload can be orders of magnitude larger
+    issue = jira.issue(ticket, fields="summary")
+    return issue.get('fields', {}).get('summary', '') or ''
+
+def _asciify_summary(summary: str) -> str:
+    """
+    Turn a non-ASCII summary into ASCII for a branch name.
+    
+    Transliterates locally by default. With AIBITJIRA_TRANSLATE=1 the summary is translated
+    to English through Google instead, falling back to transliteration if that fails.
+    
+    Args:
+        summary: Ticket summary
+        
+    Returns:
+        ASCII text to build the branch name from
+    """
+    if os.getenv("AIBITJIRA_TRANSLATE") == "1":
+        from utils.translation_cache import translate_cached
+        translated = translate_cached(summary)
+        if translated:
+            return translated
+        logger.warning(f"Translation failed for: {summary}")
+    return unidecode(summary)
+
+class _SlugTable(dict):
+    """str.translate table: keeps [a-z0-9-], lowercases A-Z and maps anything else to '-'"""
+
+    def __missing__(self, codepoint: int) -> int:
+        # Remember the answer so each character is only looked up once per process
+        self[codepoint] = ord('-')
+        return self[codepoint]
+
+_SLUG_TABLE = _SlugTable({ord(c): ord(c) for c in string.ascii_lowercase + string.digits + '-'})
+_SLUG_TABLE.update({ord(c): ord(c.lower()) for c in string.ascii_uppercase})
+
 def sanitize_branch_name(name: str) -> str:
     """
     Sanitize a string to be used as a branch name.
@@ -58,21 +201,45 @@ def sanitize_branch_name(name: str) -> str:
     Returns:
         Sanitized string suitable for a branch name
     """
-    # Replace spaces and special chars with hyphens
-    sanitized = re.sub(r'[^a-zA-Z0-9-]', '-', name)
-    # Remove consecutive hyphens
-    sanitized = re.sub(r'-+', '-', sanitized)
-    # Remove leading/trailing hyphens
-    sanitized = sanitized.strip('-')
-    return sanitized.lower()
+    # Lowercase and replace spaces and special chars with hyphens in one pass
+    sanitized = name.translate(_SLUG_TABLE)
+    # Collapse runs of hyphens and drop leading/trailing ones: splitting on '-' leaves
+    # empty parts exactly where those were
+    return '-'.join(part for part in sanitized.split('-') if part)
+
+def _new_branch_name(ticket: str, branch_type: str, refresh: bool = False) -> str:
+    """
+    Build the name {branch_type}/{ticket}-{short_desc} from the ticket's Jira summary.
+    
+    Args:
+        ticket: Jira ticket ID
+        branch_type: Branch type prefix (feature, bugfix, hotfix, etc.)
+        refresh: Fetch the ticket summary from Jira even if it is cached
+        
+    Returns:
+        Branch name
+    """
+    summary = get_issue_summary(ticket, refresh=refresh)
+    if not summary:
+        logger.warning(f"Could not get summary for ticket {ticket}")
+        summary = 'no-summary'
+    
+    # Make non-ASCII summaries usable in a branch name
+    if not summary.isascii():
+        summary = _asciify_summary(summary)
+    
+    # Create sanitized branch name
+    sanitized_summary = sanitize_branch_name(summary)
+    return f"{branch_type}/{ticket}-{sanitized_summary[:50]}"
 
-def create_branch(ticket: str, branch_type: str = "feature") -> str:
+def create_branch(ticket: str, branch_type: str = "feature", refresh: bool = False) -> str:
     """
     Create a new branch named {branch_type}/{ticket}-{short_desc} or return existing.
     
     Args:
         ticket: Jira ticket ID
         branch_type: Branch type prefix (feature, bugfix, hotfix, etc.)
+        refresh: Fetch the ticket summary from Jira even if it is cached
         
     Returns:
         Branch name
@@ -84,7 +251,7 @@ def create_branch(ticket: str, branch_type: str = "feature") -> str:
         from git.git_utils import checkout_branch, current_branch
         
         # Validate inputs
-        if not ticket or not re.match(r'^[A-Z]+-\d+$', ticket):
+        if not _valid_ticket(ticket):
             logger.warning(f"Invalid ticket format: {ticket}. Expected format: ABC-123")
         
         # Check if branch already exists
@@ -97,29 +264,7 @@ def create_branch(ticket: str, branch_type: str = "feature") -> str:
         
         # Get ticket details from Jira
         try:
-            jira = _get_jira_client()
-            issue = jira.issue(ticket)
-            
-            # Get ticket summary
-            summary = issue.get('fields', {}).get('summary', '')
-            if not summary:
-                logger.warning(f"Could not get summary for ticket {ticket}")
-                summary = 'no-summary'
-            
-            # Translate non-ASCII summary to English
-            if not summary.isascii():
-                try:
-                    translated = GoogleTranslator(source='auto', target='en').translate(summary)
-                    if translated:
-                        summary = translated
-                    else:
-                        logger.warning(f"Translation failed for: {summary}")
-                except Exception as e:
-                    logger.warning(f"Translation error: {e}")
-            
-            # Create sanitized branch name
-            sanitized_summary = sanitize_branch_name(summary)
-            branch_name = f"{branch_type}/{ticket}-{sanitized_summary[:50]}"
+            branch_name = _new_branch_name(ticket, branch_type, refresh=refresh)
             
             # Create the branch
             success = checkout_branch(branch_name, create_new=True)
@@ -142,6 +287,65 @@ def create_branch(ticket: str, branch_type: str = "feature") -> str:
         logger.error(f"Branch creation failed: {e}")
         raise
 
+def create_branches(tickets: List[str], branch_type: str = "feature", max_workers: int = 8) -> Dict[str, str]:
+    """
+    Create branches for several tickets at once, without checking any of them out.
+    
+    Summaries are fetched from Jira in bulk, and any stragglers and translation run
+    concurrently; the branches themselves are created one after another. Tickets that already have a branch keep it.
+    
+    Args:
+        tickets: Jira ticket IDs
+        branch_type: Branch type prefix (feature, bugfix, hotfix, etc.)
+        max_workers: Maximum number of tickets looked up at the same time
+        
+    Returns:
+        Mapping of ticket ID to branch name, in input order, for every ticket that has a branch
+    """
+    from git.git_utils import create_local_branch, list_local_branches
+    
+    # One branch listing for the whole batch instead of a filtered git query per ticket
+    snapshot = list_local_branches()
+    existing = set(snapshot)
+    
+    branches: Dict[str, str] = {}
+    pending = []
+    for ticket in dict.fromkeys(tickets):
+        pattern = _ticket_branch_pattern(ticket)
+        match = next((branch for branch in snapshot if pattern.search(branch)), None)
+        if match:
+            branches[ticket] = match
+        else:
+            pending.append(ticket)
+    
+    # One JQL query per batch of tickets instead of a request per ticket; the per-ticket
+    # lookups below then hit the cache
+    with _summary_cache_lock:
+        uncached = [ticket for ticket in pending if ticket not in _summary_cache]
+    for ticket, summary in _batch_fetch_summaries(uncached).items():
+        _remember_summary(ticket, summary)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_new_branch_name, ticket, branch_type): ticket for ticket in pending}
+        for future in as_completed(futures):
+            ticket = futures[future]
+            try:
+                branch_name = future.result()
+            except Exception as e:
+                logger.error(f"Error getting Jira ticket {ticket}: {e}")
+                # Fallback to simple branch name if Jira fails
+                branch_name = f"{branch_type}/{ticket}"
+            if branch_name in existing:
+                branches[ticket] = branch_name
+                continue
+            # git takes a lock on the ref; creating branches serially avoids contention
+            if create_local_branch(branch_name):
+                logger.info(f"Created branch: {branch_name}")
+                existing.add(branch_name)
+                branches[ticket] = branch_name
+    
+    return {ticket: branches[ticket] for ticket in tickets if ticket in branches}
+
 def find_branches(ticket: str = None) -> List[str]:
     """
     List all local branches, optionally filtered by ticket.
@@ -154,13 +358,13 @@ def find_branches(ticket: str = None) -> List[str]:
     """
     try:
         from git.git_utils import list_local_branches
-        branches = list_local_branches()
-        
-        if ticket:
-            # Ensure case-insensitive matching
-            branches = [branch for branch in branches if ticket.lower() in branch.lower()]
-            
-        return branches
+        # git narrows the listing by substring (case-insensitive); the ticket pattern then
+        # drops near misses such as ABC-12 when looking for ABC-1
+        branches = list_local_branches(pattern=ticket)
+        if not ticket:
+            return branches
+        pattern = _ticket_branch_pattern(ticket)
+        return [branch for branch in branches if pattern.search(branch)]
     except Exception as e:
         logger.error(f"Error listing branches: {e}")
         return []
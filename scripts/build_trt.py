@@ -0,0 +1,46 @@
+"""
+Build a TensorRT-LLM engine for the model server.
+
+Usage:
+    python -m scripts.build_trt --model-id meta-llama/Meta-Llama-3-8B-Instruct --output ./trt_engine
+
+Then start the server with USE_TRT=1 (and TRT_ENGINE_DIR if --output differs from ./trt_engine).
+Requires an NVIDIA GPU and the optimum-nvidia package.
+"""
+import argparse
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+def build_engine(model_id: str, output_dir: str):
+    """
+    Compile the HuggingFace checkpoint into a TensorRT-LLM engine and save it.
+    
+    Args:
+        model_id: HuggingFace model ID or local checkpoint path
+        output_dir: Directory to write the engine to
+    """
+    from optimum.nvidia import AutoModelForCausalLM
+
+    logger.info(f"Building TensorRT engine for {model_id}...")
+    model = AutoModelForCausalLM.from_pretrained(model_id)
+    model.save_pretrained(output_dir)
+    logger.info(f"Engine saved to {output_dir}")
+
+def main():
+    from utils.logging_config import configure as configure_logging
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Build a TensorRT-LLM engine for the model server")
+    parser.add_argument("--model-id", default=os.getenv("MODEL_ID"), help="Model ID (defaults to MODEL_ID)")
+    parser.add_argument("--output", default=os.getenv("TRT_ENGINE_DIR", "./trt_engine"),
+                        help="Output directory for the engine")
+    args = parser.parse_args()
+
+    if not args.model_id:
+        parser.error("--model-id is required when MODEL_ID is not set")
+    build_engine(args.model_id, args.output)
+
+if __name__ == "__main__":
+    main()
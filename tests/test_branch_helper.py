@@ -0,0 +1,71 @@
+import pytest
+
+import git.git_utils as git_utils
+from jira import branch_helper
+
+
+@pytest.fixture
+def local_branches(monkeypatch):
+    """Stand in for the repository's local branches; created branches are recorded"""
+    branches = []
+    created = []
+
+    def list_local_branches(pattern=None):
+        # Same case-insensitive substring filter git for-each-ref applies
+        return [b for b in branches if not pattern or pattern.lower() in b.lower()]
+
+    def create_local_branch(name):
+        created.append(name)
+        branches.append(name)
+        return True
+
+    def checkout_branch(name, create_new=False):
+        return create_local_branch(name) if create_new else name in branches
+
+    monkeypatch.setattr(git_utils, "list_local_branches", list_local_branches)
+    monkeypatch.setattr(git_utils, "create_local_branch", create_local_branch)
+    monkeypatch.setattr(git_utils, "checkout_branch", checkout_branch)
+    monkeypatch.setattr(branch_helper, "_get_summary_disk_cache", lambda: None)
+    branch_helper._summary_cache.clear()
+    yield branches, created
+    branch_helper._summary_cache.clear()
+
+
+def test_create_branches(local_branches, monkeypatch):
+    branches, created = local_branches
+    branches.append("feature/ABC-12-existing-work")
+
+    def fetch(tickets):
+        # ABC-3 is missing from the batch result and its single lookup fails too
+        return {"ABC-1": "Fix login"} if "ABC-1" in tickets else {}
+
+    def fetch_one(ticket):
+        raise RuntimeError("Jira unavailable")
+
+    monkeypatch.setattr(branch_helper, "_batch_fetch_summaries", fetch)
+    monkeypatch.setattr(branch_helper, "_fetch_issue_summary", fetch_one)
+
+    result = branch_helper.create_branches(["ABC-1", "ABC-12", "ABC-3", "ABC-1"])
+
+    # ABC-12's branch is reused and must not be mistaken for ABC-1's
+    assert result == {
+        "ABC-1": "feature/ABC-1-fix-login",
+        "ABC-12": "feature/ABC-12-existing-work",
+        "ABC-3": "feature/ABC-3",
+    }
+    # The duplicate ABC-1 is only created once
+    assert sorted(created) == ["feature/ABC-1-fix-login", "feature/ABC-3"]
+
+
+def test_create_branch_ignores_longer_ticket_ids(local_branches, monkeypatch):
+    branches, created = local_branches
+    branches.extend(["feature/abc-12-bar", "xABC-1", "bugfix/ABC-1-fix-login"])
+    monkeypatch.setattr(branch_helper, "_fetch_issue_summary", lambda ticket: "New work")
+
+    assert branch_helper.find_branches("ABC-1") == ["bugfix/ABC-1-fix-login"]
+    assert branch_helper.create_branch("ABC-1") == "bugfix/ABC-1-fix-login"
+    assert branch_helper.find_branches("ABC-12") == ["feature/abc-12-bar"]
+    # "xABC-1" only contains the ID, so ABC-1 without its branch gets a new one
+    branches.remove("bugfix/ABC-1-fix-login")
+    assert branch_helper.create_branch("ABC-1") == "feature/ABC-1-new-work"
+    assert created == ["feature/ABC-1-new-work"]
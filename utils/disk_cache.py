@@ -0,0 +1,29 @@
+import os
+import functools
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Root of the persistent caches; each module keeps its entries in its own subdirectory
+CACHE_DIR = os.path.expanduser("~/.cache/bitjira")
+
+@functools.lru_cache(maxsize=None)
+def open_disk_cache(subdir: str):
+    """
+    Open a persistent cache under CACHE_DIR once per process.
+
+    Args:
+        subdir: Subdirectory of CACHE_DIR holding this cache, e.g. "jira"
+
+    Returns:
+        diskcache.Cache, or None if diskcache is unavailable or the cache cannot be opened
+    """
+    try:
+        from diskcache import Cache
+    except ImportError:
+        return None
+    try:
+        return Cache(os.path.join(CACHE_DIR, subdir))
+    except Exception as e:
+        logger.warning(f"Could not open {subdir} disk cache: {e}")
+        return None
@@ -0,0 +1,18 @@
+import logging
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def configure(level: int = logging.INFO):
+    """
+    Configure root logging once for an entry point.
+    
+    Library modules only create loggers with logging.getLogger(__name__); the CLI and the
+    model server call this when run as programs. Later calls are no-ops.
+    
+    Args:
+        level: Root logger level
+    """
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    logging.basicConfig(level=level, format=LOG_FORMAT)
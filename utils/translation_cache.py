@@ -0,0 +1,51 @@
+import hashlib
+import functools
+import logging
+from typing import Optional
+from deep_translator import GoogleTranslator
+from utils.disk_cache import open_disk_cache
+
+logger = logging.getLogger(__name__)
+
+# Translations are kept in memory for the process and, when diskcache is installed,
+# on disk for two weeks so re-running for the same ticket needs no request to Google
+TRANSLATION_CACHE_TTL = 14 * 24 * 3600
+TARGET_LANGUAGE = "en"
+
+# Created once; building a translator validates its language settings
+_translator = GoogleTranslator(source='auto', target=TARGET_LANGUAGE)
+def _cache_key(text: str) -> str:
+    return f"{TARGET_LANGUAGE}:{hashlib.sha1(text.encode('utf-8')).hexdigest()}"
+
+@functools.lru_cache(maxsize=512)
+def _translate(text: str) -> str:
+    disk_cache = open_disk_cache("trans")
+    key = _cache_key(text)
+    if disk_cache is not None:
+        cached = disk_cache.get(key)
+        if cached is not None:
+            return cached
+
+    translated = _translator.translate(text)
+    if not translated:
+        # Raise rather than return so lru_cache doesn't remember the failure
+        raise ValueError("empty translation")
+    if disk_cache is not None:
+        disk_cache.set(key, translated, expire=TRANSLATION_CACHE_TTL)
+    return translated
+
+def translate_cached(text: str) -> Optional[str]:
+    """
+    Translate text to English, checking the memory and disk caches before calling Google.
+    
+    Args:
+        text: Text to translate
+        
+    Returns:
+        Translated text, or None if translation failed
+    """
+    try:
+        return _translate(text)
+    except Exception as e:
+        logger.warning(f"Translation error: {e}")
+        return None